@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Troubleshooting MCP Server - Setup Self-Test
+
+Runs the validation checks in tests/test_server.py to confirm that all
+dependencies are installed and the server can initialize. Run this before
+configuring Claude Desktop to ensure everything works.
+
+Usage:
+    python scripts/selftest.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+TEST_FILE = Path(__file__).resolve().parent.parent / "tests" / "test_server.py"
+
+
+def main():
+    """Run the server validation tests and report the result."""
+    # importlib mode keeps the root troubleshooting_mcp.py shim from shadowing the package
+    exit_code = pytest.main(
+        [str(TEST_FILE), "-q", "-n", "0", "--no-cov", "--import-mode=importlib"]
+    )
+
+    if exit_code == 0:
+        print("\n✓ All tests passed! Server is ready to use.")
+        print("\nNext steps:")
+        print("1. Review QUICKSTART.md for configuration instructions")
+        print("2. Add server to Claude Desktop config")
+        print("3. Restart Claude Desktop")
+    else:
+        print("\n✗ Some tests failed. Please resolve issues before proceeding.")
+        print("\nTo fix issues:")
+        print("1. Install missing dependencies: pip install -r requirements.txt")
+        print("2. Verify Python version is 3.10 or higher")
+    return int(exit_code)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
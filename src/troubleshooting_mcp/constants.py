@@ -6,25 +6,27 @@ Constants used throughout the Troubleshooting MCP Server.
 CHARACTER_LIMIT = 25000
 
 # Whitelisted safe commands that can be executed
-SAFE_COMMANDS = {
-    "ping",
-    "traceroute",
-    "nslookup",
-    "dig",
-    "netstat",
-    "ss",
-    "ip",
-    "ifconfig",
-    "df",
-    "du",
-    "free",
-    "uptime",
-    "uname",
-    "lsblk",
-    "lsof",
-    "whoami",
-    "hostname",
-}
+SAFE_COMMANDS = frozenset(
+    {
+        "ping",
+        "traceroute",
+        "nslookup",
+        "dig",
+        "netstat",
+        "ss",
+        "ip",
+        "ifconfig",
+        "df",
+        "du",
+        "free",
+        "uptime",
+        "uname",
+        "lsblk",
+        "lsof",
+        "whoami",
+        "hostname",
+    }
+)
 
 # Blocked arguments for safe commands to prevent abuse
 ARGUMENT_BLOCKLIST = {
@@ -34,6 +36,27 @@ ARGUMENT_BLOCKLIST = {
     "lsof": ["+D"],
 }
 
+# Read-only subcommands allowed for the ip command, keyed by ip object.
+# Any object or action not listed here (e.g. "netns", "link set") is rejected.
+IP_READ_ONLY_SUBCOMMANDS = {
+    "address": ["show", "list", "lst", "help"],
+    "addrlabel": ["list", "help"],
+    "maddress": ["show", "list", "lst", "help"],
+    "route": ["show", "list", "lst", "get", "help"],
+    "rule": ["show", "list", "lst", "help"],
+    "neighbor": ["show", "list", "lst", "get", "help"],
+    "neighbour": ["show", "list", "lst", "get", "help"],
+    "ntable": ["show", "help"],
+    "link": ["show", "list", "lst", "help"],
+    "tunnel": ["show", "list", "lst", "help"],
+    "netconf": ["show", "help"],
+    "nexthop": ["show", "list", "lst", "get", "help"],
+    "help": [],
+}
+
+# Options allowed for ifconfig, which may only display interfaces
+IFCONFIG_DISPLAY_OPTIONS = {"-a", "-s", "-v", "-l"}
+
 # Common log file locations across different systems
 COMMON_LOG_PATHS = [
     # Linux system logs
@@ -2,11 +2,188 @@
 Pydantic models for input validation across all tools.
 """
 
+import re
+import sys
+from collections.abc import Mapping
+from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Annotated
+
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    StringConstraints,
+    field_validator,
+    model_validator,
+)
+
+from .constants import (
+    ARGUMENT_BLOCKLIST,
+    IFCONFIG_DISPLAY_OPTIONS,
+    IP_READ_ONLY_SUBCOMMANDS,
+    SAFE_COMMANDS,
+)
+
+# Shell metacharacters rejected in command arguments. Screening deletes these characters
+# with str.translate and compares lengths, so clean arguments never leave C code.
+_FORBIDDEN_ARG_CHARS = ";|&`$()<>{}!\\\"'*?\n\r"
+_FORBIDDEN_ARG_TABLE = str.maketrans("", "", _FORBIDDEN_ARG_CHARS)
+
+# Sorted whitelist shown in the field description and in rejection messages
+_SAFE_COMMANDS_TEXT = ", ".join(sorted(SAFE_COMMANDS))
+
+
+def _compile_prefix_pattern(prefixes: list[str]) -> re.Pattern[str]:
+    # Alternatives are tried in order, so shortest-first reports the shortest blocked prefix
+    ordered = sorted(set(prefixes), key=lambda prefix: (len(prefix), prefix))
+    # An empty blocklist must never match, rather than match every argument
+    return re.compile("|".join(re.escape(prefix) for prefix in ordered) or "(?!)")
+
+
+@dataclass(slots=True, frozen=True)
+class ArgumentPolicy:
+    """Blocked argument prefixes for a single whitelisted command."""
+
+    pattern: re.Pattern[str]
+
+    def match(self, arg: str) -> str | None:
+        """Return the blocked prefix that arg starts with, found in one regex match."""
+        hit = self.pattern.match(arg)
+        return hit.group() if hit else None
+
+
+# Read-only policy table built once at import from ARGUMENT_BLOCKLIST. Command keys are
+# interned so lookups against other interned strings resolve on identity.
+ARGUMENT_POLICIES: Mapping[str, ArgumentPolicy] = MappingProxyType(
+    {
+        sys.intern(command): ArgumentPolicy(pattern=_compile_prefix_pattern(blocked))
+        for command, blocked in ARGUMENT_BLOCKLIST.items()
+    }
+)
+
+# ip resolves an abbreviated object to the first entry of its command table that starts
+# with it ("a" -> address, "net" -> netns), so this order mirrors iproute2's table.
+_IP_OBJECT_ORDER = (
+    "address",
+    "addrlabel",
+    "maddress",
+    "route",
+    "rule",
+    "neighbor",
+    "neighbour",
+    "ntable",
+    "ntbl",
+    "link",
+    "l2tp",
+    "fou",
+    "ila",
+    "macsec",
+    "tunnel",
+    "tunl",
+    "tuntap",
+    "tap",
+    "token",
+    "tcpmetrics",
+    "tcp_metrics",
+    "monitor",
+    "xfrm",
+    "mroute",
+    "mrule",
+    "netns",
+    "netconf",
+    "vrf",
+    "sr",
+    "nexthop",
+    "mptcp",
+    "ioam",
+    "help",
+    "stats",
+)
+
+# Token trie of allowed ip invocations: object -> action -> (end)
+_Trie = dict[str, "_Trie"]
+_IP_COMMAND_TRIE: _Trie = {
+    sys.intern(obj): {sys.intern(action): {} for action in actions}
+    for obj, actions in IP_READ_ONLY_SUBCOMMANDS.items()
+}
+_IFCONFIG_OPTIONS = frozenset(map(sys.intern, IFCONFIG_DISPLAY_OPTIONS))
+
+
+def _resolve_ip_object(token: str) -> str | None:
+    if not token:
+        return None
+    return next((obj for obj in _IP_OBJECT_ORDER if obj.startswith(token)), None)
+
+
+def _check_ip_args(args: tuple[str, ...]) -> str | None:
+    """Walk ip's options and subcommand tokens, returning an error for disallowed ones."""
+    policy = ARGUMENT_POLICIES["ip"]
+    position = next((i for i, token in enumerate(args) if not token.startswith("-")), len(args))
+    for token in args[:position]:
+        # ip treats "--option" the same as "-option"
+        option = token[1:] if token.startswith("--") else token
+        blocked = policy.match(option)
+        if blocked:
+            return (
+                f"Argument '{token}' is not allowed for command 'ip' "
+                f"(contains forbidden pattern '{blocked}')"
+            )
+
+    node = _IP_COMMAND_TRIE
+    for depth, token in enumerate(args[position : position + 2]):
+        key = _resolve_ip_object(token) if depth == 0 else token
+        if key not in node:
+            return (
+                f"Argument '{token}' is not allowed for command 'ip' "
+                f"(only read-only subcommands are permitted)"
+            )
+        node = node[key]
+    return None
+
+
+def _check_ifconfig_args(args: tuple[str, ...]) -> str | None:
+    """Allow ifconfig to list interfaces or show a single one, never to configure them."""
+    interfaces = 0
+    for arg in args:
+        if arg.startswith("-"):
+            allowed = arg in _IFCONFIG_OPTIONS
+        else:
+            interfaces += 1
+            allowed = interfaces == 1
+        if not allowed:
+            return (
+                f"Argument '{arg}' is not allowed for command 'ifconfig' "
+                f"(interfaces can only be displayed)"
+            )
+    return None
+
+
+_SUBCOMMAND_CHECKS = {"ip": _check_ip_args, "ifconfig": _check_ifconfig_args}
+
+
+@lru_cache(maxsize=1024)
+def _check_command_args(command: str, args: tuple[str, ...]) -> str | None:
+    """Return the rejection message for a command's arguments, or None if they are allowed.
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+    Results are cached so clients repeating the same invocation skip the policy checks.
+    """
+    policy = ARGUMENT_POLICIES.get(command)
+    if policy:
+        for arg in args:
+            blocked = policy.match(arg)
+            if blocked:
+                return (
+                    f"Argument '{arg}' is not allowed for command '{command}' "
+                    f"(contains forbidden pattern '{blocked}')"
+                )
 
-from .constants import ARGUMENT_BLOCKLIST, SAFE_COMMANDS
+    subcommand_check = _SUBCOMMAND_CHECKS.get(command)
+    if subcommand_check:
+        return subcommand_check(args)
+    return None
 
 
 class ResponseFormat(str, Enum):
@@ -145,17 +322,28 @@ class EnvironmentSearchInput(BaseModel):
 
 
 class SafeCommandInput(BaseModel):
-    """Input model for safe command execution."""
-
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
-
-    command: str = Field(
+    """Input model for safe command execution.
+
+    Instances are frozen once validated so a checked command can be reused safely.
+    """
+
+    model_config = ConfigDict(str_strip_whitespace=True, frozen=True, extra="forbid")
+
+    command: Annotated[
+        str,
+        StringConstraints(
+            strip_whitespace=True,
+            to_lower=True,
+            min_length=1,
+            max_length=32,
+            pattern=r"^[A-Za-z][A-Za-z0-9_-]*$",
+        ),
+    ] = Field(
         ...,
-        description=f"Command to execute (must be one of: {', '.join(sorted(SAFE_COMMANDS))})",
-        min_length=1,
-        max_length=200,
+        description=f"Command to execute (must be one of: {_SAFE_COMMANDS_TEXT})",
     )
-    args: list[str] | None = Field(
+    # Per-argument length cap also bounds what the _check_command_args cache can hold
+    args: list[Annotated[str, StringConstraints(max_length=500)]] | None = Field(
         default_factory=list,
         description="Command arguments (e.g., ['-a', '-l'] for 'ls -a -l')",
         max_items=20,
@@ -164,29 +352,36 @@ class SafeCommandInput(BaseModel):
         default=30, description="Command timeout in seconds (default: 30)", ge=1, le=300
     )
 
-    @field_validator("command")
+    @field_validator("args")
     @classmethod
-    def validate_command(cls, v: str) -> str:
-        cmd = v.strip().lower()
-        if cmd not in SAFE_COMMANDS:
+    def validate_arg_characters(cls, v: list[str] | None) -> list[str] | None:
+        if not v:
+            return v
+        # Fast path: screen every argument in one translate call, and only walk them
+        # individually to name the offender when something was removed
+        joined = "".join(v)
+        if len(joined.translate(_FORBIDDEN_ARG_TABLE)) == len(joined):
+            return v
+        for arg in v:
+            if len(arg.translate(_FORBIDDEN_ARG_TABLE)) != len(arg):
+                char = next(c for c in arg if c in _FORBIDDEN_ARG_CHARS)
+                raise ValueError(f"Argument '{arg}' contains forbidden character '{char}'")
+        return v
+
+    @model_validator(mode="after")
+    def validate_command(self) -> "SafeCommandInput":
+        # Stripping and lowercasing already happened in pydantic-core
+        if self.command not in SAFE_COMMANDS:
             raise ValueError(
-                f"Command '{v}' is not in the whitelist. "
-                f"Allowed commands: {', '.join(sorted(SAFE_COMMANDS))}"
+                f"Command '{self.command}' is not in the whitelist. "
+                f"Allowed commands: {_SAFE_COMMANDS_TEXT}"
             )
-        return cmd
+        return self
 
     @model_validator(mode="after")
     def validate_args(self) -> "SafeCommandInput":
-        command = self.command
-        args = self.args
-
-        if command in ARGUMENT_BLOCKLIST and args:
-            blocked_prefixes = ARGUMENT_BLOCKLIST[command]
-            for arg in args:
-                for blocked in blocked_prefixes:
-                    if arg.startswith(blocked):
-                        raise ValueError(
-                            f"Argument '{arg}' is not allowed for command '{command}' "
-                            f"(contains forbidden pattern '{blocked}')"
-                        )
+        if self.args:
+            error = _check_command_args(self.command, tuple(self.args))
+            if error:
+                raise ValueError(error)
         return self
@@ -3,12 +3,26 @@ Process Search Tool - Search for running processes.
 """
 
 import json
+import re
 
 import psutil
 
 from ..models import ProcessSearchInput, ResponseFormat
 from ..utils import check_character_limit, format_bytes, handle_error
 
+# Only these fields are read from each process, so psutil skips everything else
+_PROCESS_ATTRS = ("pid", "name", "cpu_percent", "memory_info", "status", "cmdline")
+
+# Secret-bearing command line options (key=value form) whose values are masked
+_SECRET_RE = re.compile(
+    r"(?i)(-{0,2}D?(?:password|passwd|pwd|secret|token|apikey|api[_-]?key|auth)=)(\S+)"
+)
+
+
+def _mask_cmdline(cmdline: list[str]) -> str:
+    """Join the first command line tokens with secret option values masked."""
+    return " ".join([_SECRET_RE.sub(r"\1********", token) for token in cmdline[:3]])
+
 
 def register_process_search(mcp):
     """Register the process search tool with the MCP server."""
@@ -64,24 +78,18 @@ def register_process_search(mcp):
         """
         try:
             processes = []
+            pattern_lower = params.pattern.lower() if params.pattern else None
 
             # Iterate through all running processes
-            for proc in psutil.process_iter(
-                ["pid", "name", "cpu_percent", "memory_info", "status", "cmdline"]
-            ):
+            for proc in psutil.process_iter(_PROCESS_ATTRS):
                 try:
                     pinfo = proc.info
 
-                    # Apply pattern filter if provided
-                    if params.pattern:
-                        pattern_lower = params.pattern.lower()
-                        name_match = pattern_lower in pinfo["name"].lower()
-                        cmdline_match = False
-                        if pinfo["cmdline"]:
-                            cmdline_str = " ".join(pinfo["cmdline"]).lower()
-                            cmdline_match = pattern_lower in cmdline_str
-
-                        if not (name_match or cmdline_match):
+                    # Apply pattern filter if provided, only joining the command line
+                    # when the process name does not already match
+                    if pattern_lower and pattern_lower not in (pinfo["name"] or "").lower():
+                        cmdline = pinfo["cmdline"]
+                        if not cmdline or pattern_lower not in " ".join(cmdline).lower():
                             continue
 
                     # Get memory in bytes
@@ -96,7 +104,7 @@ def register_process_search(mcp):
                             "memory_formatted": format_bytes(mem_bytes),
                             "status": pinfo["status"],
                             "cmdline": (
-                                " ".join(pinfo["cmdline"][:3])
+                                _mask_cmdline(pinfo["cmdline"])
                                 if pinfo["cmdline"]
                                 else pinfo["name"]
                             ),
@@ -2,13 +2,36 @@
 Safe Command Execution Tool - Execute whitelisted diagnostic commands.
 """
 
+import os
 import shutil
 import subprocess
+from functools import lru_cache
 
 from ..models import SafeCommandInput
 from ..utils import check_character_limit, handle_error
 
 
+@lru_cache(maxsize=128)
+def _which_found(command: str, search_path: str | None) -> str:
+    # lru_cache does not store raised exceptions, so only successful lookups are cached
+    command_path = shutil.which(command, path=search_path)
+    if command_path is None:
+        raise FileNotFoundError(command)
+    return command_path
+
+
+def _which(command: str, search_path: str | None) -> str | None:
+    """Resolve a command on the given PATH, caching hits so repeat calls skip the PATH scan.
+
+    Misses are not cached, so a command installed while the server runs is found
+    on the next call.
+    """
+    try:
+        return _which_found(command, search_path)
+    except FileNotFoundError:
+        return None
+
+
 def register_safe_command(mcp):
     """Register the safe command execution tool with the MCP server."""
 
@@ -64,7 +87,7 @@ def register_safe_command(mcp):
         """
         try:
             # Check if command exists on system
-            command_path = shutil.which(params.command)
+            command_path = _which(params.command, os.environ.get("PATH"))
             if not command_path:
                 return f"Error: Command '{params.command}' not found on this system"
 
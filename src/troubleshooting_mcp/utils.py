@@ -6,6 +6,23 @@ from datetime import datetime
 
 from .constants import CHARACTER_LIMIT
 
+_BYTE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+# (divisor, unit) indexed by bit_length() - 1; each unit spans 10 bits, PB is the cap
+_BYTE_THRESHOLDS = tuple(
+    (1 << (10 * min(bit // 10, 5)), _BYTE_UNITS[min(bit // 10, 5)]) for bit in range(51)
+)
+
+# Message template per exception type; handle_error walks the MRO so subclasses match
+_ERROR_TEMPLATES: dict[type, str] = {
+    PermissionError: (
+        "Error: Permission denied. You may need elevated privileges to perform this operation."
+    ),
+    FileNotFoundError: "Error: File or resource not found. Please check the path is correct.",
+    TimeoutError: "Error: Operation timed out. Please try again or increase the timeout value.",
+    ValueError: "Error: Invalid input - {}",
+}
+
 
 def format_bytes(bytes_value: int) -> str:
     """
@@ -17,11 +34,11 @@ def format_bytes(bytes_value: int) -> str:
     Returns:
         Formatted string (e.g., "1.5 GB")
     """
-    for unit in ["B", "KB", "MB", "GB", "TB"]:
-        if bytes_value < 1024.0:
-            return f"{bytes_value:.2f} {unit}"
-        bytes_value /= 1024.0
-    return f"{bytes_value:.2f} PB"
+    if bytes_value < 1024:
+        return f"{bytes_value:.2f} B"
+    bit = int(bytes_value).bit_length() - 1
+    divisor, unit = _BYTE_THRESHOLDS[bit if bit < 50 else 50]
+    return f"{bytes_value / divisor:.2f} {unit}"
 
 
 def format_timestamp(timestamp: float) -> str:
@@ -47,16 +64,10 @@ def handle_error(e: Exception) -> str:
     Returns:
         User-friendly error message
     """
-    if isinstance(e, PermissionError):
-        return (
-            "Error: Permission denied. You may need elevated privileges to perform this operation."
-        )
-    elif isinstance(e, FileNotFoundError):
-        return "Error: File or resource not found. Please check the path is correct."
-    elif isinstance(e, TimeoutError):
-        return "Error: Operation timed out. Please try again or increase the timeout value."
-    elif isinstance(e, ValueError):
-        return f"Error: Invalid input - {str(e)}"
+    for cls in type(e).__mro__:
+        template = _ERROR_TEMPLATES.get(cls)
+        if template is not None:
+            return template.format(e)
     return f"Error: {type(e).__name__} - {str(e)}"
 
 
@@ -71,13 +82,12 @@ def check_character_limit(content: str, data_type: str = "response") -> str:
     Returns:
         Original content or truncated content with warning
     """
-    if len(content) > CHARACTER_LIMIT:
-        truncated = content[:CHARACTER_LIMIT]
-        truncation_msg = (
-            f"\n\n--- TRUNCATED ---\n"
-            f"Response exceeded {CHARACTER_LIMIT} characters. "
-            f"Original size: {len(content)} characters. "
-            f"Consider using filters or limiting the scope of your query."
-        )
-        return truncated + truncation_msg
-    return content
+    size = len(content)
+    if size <= CHARACTER_LIMIT:
+        return content
+    return (
+        f"{content[:CHARACTER_LIMIT]}\n\n--- TRUNCATED ---\n"
+        f"Response exceeded {CHARACTER_LIMIT} characters. "
+        f"Original size: {size} characters. "
+        f"Consider using filters or limiting the scope of your query."
+    )
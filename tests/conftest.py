@@ -2,14 +2,156 @@
 Pytest configuration and shared fixtures for Troubleshooting MCP Server tests.
 """
 
-import sys
-from pathlib import Path
+import re
+from functools import lru_cache
+from unittest.mock import MagicMock, patch
 
+import psutil
 import pytest
 
-# Add src to path for imports
-src_path = Path(__file__).parent.parent / "src"
-sys.path.insert(0, str(src_path))
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+from troubleshooting_mcp.constants import CHARACTER_LIMIT
+from troubleshooting_mcp.tools import register_all_tools
+
+# Shared by the sample_log_content and sample_log fixtures
+_SAMPLE_LOG_CONTENT = """2025-01-05 10:00:00 INFO Starting application
+2025-01-05 10:00:01 DEBUG Loading configuration
+2025-01-05 10:00:02 ERROR Connection failed
+2025-01-05 10:00:03 WARNING Retrying connection
+2025-01-05 10:00:04 INFO Application started successfully
+"""
+_SAMPLE_LOG_BYTES = _SAMPLE_LOG_CONTENT.encode()
+
+# Matches the message raised by SafeCommandInput when an argument is blocked
+_BLOCKED_ARG_RE = re.compile(
+    r"Argument '(?P<arg>[^']*)' is not allowed for command '(?P<command>[^']*)'"
+)
+
+
+def _assert_blocked(error, arg):
+    match = _BLOCKED_ARG_RE.search(str(error))
+    assert match, f"Expected a blocked argument error, got: {error}"
+    assert match.group("arg") == arg
+
+
+@pytest.fixture
+def assert_blocked():
+    """Assert that a validation error was raised for a specific blocked argument."""
+    return _assert_blocked
+
+
+def _maybe_json(text):
+    # Error and Markdown responses never start with a JSON container, so skip parsing them
+    if not text or text[0] not in "{[":
+        return None
+    try:
+        return _json_loads(text)
+    except ValueError:
+        return None
+
+
+@pytest.fixture(scope="session")
+def maybe_json():
+    """Parse a tool response as JSON, or return None when it is not JSON."""
+    return _maybe_json
+
+
+@pytest.fixture
+def non_blocking_cpu_percent(monkeypatch):
+    """Sample CPU usage without the resource monitor's blocking one-second window."""
+    sample = psutil.cpu_percent
+
+    def cpu_percent(interval=None, percpu=False):
+        return sample(interval=None, percpu=percpu)
+
+    monkeypatch.setattr(psutil, "cpu_percent", cpu_percent)
+
+
+@pytest.fixture
+def refused_socket():
+    """Make the network diagnostic's port test fail fast with a refused connection."""
+    sock = MagicMock()
+    sock.connect.side_effect = ConnectionRefusedError
+    with patch("troubleshooting_mcp.tools.network_diagnostic.socket.socket", return_value=sock):
+        yield sock
+
+
+class FakeMCP:
+    """Minimal stand-in for FastMCP that records registered tools by name."""
+
+    __slots__ = ("name", "tools")
+
+    def __init__(self):
+        self.name = "test"
+        self.tools = {}
+
+    def tool(self, *args, name, **kwargs):
+        def decorator(func):
+            self.tools[name] = func
+            return func
+
+        return decorator
+
+
+@lru_cache(maxsize=1)
+def _registered_tools():
+    # Memoized at module level so in-process reruns (repeat plugins, mutation
+    # testing, repeated pytest.main calls) register the tools only once
+    mcp = FakeMCP()
+    register_all_tools(mcp)
+    return mcp.tools
+
+
+@pytest.fixture(scope="session")
+def tool_funcs():
+    """Every diagnostic tool, registered once per process and keyed by tool name."""
+    return _registered_tools()
+
+
+@pytest.fixture(scope="session")
+def system_info_func(tool_funcs):
+    """The system info tool."""
+    return tool_funcs["troubleshooting_get_system_info"]
+
+
+@pytest.fixture(scope="session")
+def resource_monitor_func(tool_funcs):
+    """The resource monitor tool."""
+    return tool_funcs["troubleshooting_monitor_resources"]
+
+
+@pytest.fixture(scope="session")
+def log_reader_func(tool_funcs):
+    """The log reader tool."""
+    return tool_funcs["troubleshooting_read_log_file"]
+
+
+@pytest.fixture(scope="session")
+def network_diagnostic_func(tool_funcs):
+    """The network diagnostic tool."""
+    return tool_funcs["troubleshooting_test_network_connectivity"]
+
+
+@pytest.fixture(scope="session")
+def process_search_func(tool_funcs):
+    """The process search tool."""
+    return tool_funcs["troubleshooting_search_processes"]
+
+
+@pytest.fixture(scope="session")
+def environment_inspect_func(tool_funcs):
+    """The environment inspect tool."""
+    return tool_funcs["troubleshooting_inspect_environment"]
+
+
+@pytest.fixture(scope="session")
+def safe_command_func(tool_funcs):
+    """The safe command tool."""
+    return tool_funcs["troubleshooting_execute_safe_command"]
 
 
 @pytest.fixture
@@ -44,12 +186,38 @@ def mock_process_data():
     ]
 
 
+@pytest.fixture(scope="session")
+def oversized_content():
+    """Content 1000 characters past CHARACTER_LIMIT, built once per session."""
+    return "x" * (CHARACTER_LIMIT + 1000)
+
+
 @pytest.fixture
 def sample_log_content():
     """Sample log file content."""
-    return """2025-01-05 10:00:00 INFO Starting application
-2025-01-05 10:00:01 DEBUG Loading configuration
-2025-01-05 10:00:02 ERROR Connection failed
-2025-01-05 10:00:03 WARNING Retrying connection
-2025-01-05 10:00:04 INFO Application started successfully
-"""
+    return _SAMPLE_LOG_CONTENT
+
+
+@pytest.fixture(scope="session")
+def sample_log(tmp_path_factory):
+    """Sample log file written once per session; tests must not modify it."""
+    log_file = tmp_path_factory.mktemp("logs") / "test.log"
+    log_file.write_bytes(_SAMPLE_LOG_BYTES)
+    return log_file
+
+
+@pytest.fixture
+def allowed_log_dir(monkeypatch, sample_log):
+    """Allow the log reader to open files in the sample_log directory for one test."""
+    monkeypatch.setattr(
+        "troubleshooting_mcp.tools.log_reader.ALLOWED_LOG_DIRS", [str(sample_log.parent)]
+    )
+    return sample_log.parent
+
+
+@pytest.fixture(scope="session")
+def sample_syslog(tmp_path_factory):
+    """Sample log named like a system syslog, written once per session."""
+    log_file = tmp_path_factory.mktemp("syslog") / "syslog"
+    log_file.write_bytes(b"Test log entry\n")
+    return log_file
@@ -3,6 +3,7 @@ Tests for constants module.
 """
 
 from troubleshooting_mcp.constants import (
+    ARGUMENT_BLOCKLIST,
     CHARACTER_LIMIT,
     COMMON_LOG_PATHS,
     SAFE_COMMANDS,
@@ -17,8 +18,8 @@ def test_character_limit_is_positive():
 
 
 def test_safe_commands_is_set():
-    """Test that SAFE_COMMANDS is a set."""
-    assert isinstance(SAFE_COMMANDS, set)
+    """Test that SAFE_COMMANDS is an immutable set."""
+    assert isinstance(SAFE_COMMANDS, frozenset)
     assert len(SAFE_COMMANDS) > 0
 
 
@@ -34,6 +35,13 @@ def test_safe_commands_no_dangerous_commands():
     assert not dangerous_commands.intersection(SAFE_COMMANDS)
 
 
+def test_argument_blocklist_targets_safe_commands():
+    """Test that every blocklist entry belongs to a whitelisted command."""
+    for command, prefixes in ARGUMENT_BLOCKLIST.items():
+        assert command in SAFE_COMMANDS
+        assert len(prefixes) > 0
+
+
 def test_common_log_paths_is_list():
     """Test that COMMON_LOG_PATHS is a list."""
     assert isinstance(COMMON_LOG_PATHS, list)
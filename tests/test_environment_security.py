@@ -1,25 +1,18 @@
 
+import asyncio
 import os
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
-from src.troubleshooting_mcp.models import EnvironmentSearchInput
-from src.troubleshooting_mcp.tools import environment_inspect
+import pytest
 
-class TestEnvironmentSecurity(unittest.TestCase):
-    def setUp(self):
-        self.mcp = MagicMock()
-        self.tool_funcs = []
+from troubleshooting_mcp.models import EnvironmentSearchInput
 
-        def mock_tool(*args, **kwargs):
-            def decorator(func):
-                self.tool_funcs.append(func)
-                return func
-            return decorator
 
-        self.mcp.tool = mock_tool
-        environment_inspect.register_environment_inspect(self.mcp)
-        self.func = self.tool_funcs[0]
+class TestEnvironmentSecurity(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _tool(self, environment_inspect_func):
+        self.func = environment_inspect_func
 
     @patch.dict(os.environ, {
         "MY_PUBLIC_VAR": "public_value",
@@ -37,14 +30,18 @@ class TestEnvironmentSecurity(unittest.TestCase):
     })
     def test_environment_masking(self):
         # We need to run the async function
-        import asyncio
-
         async def run_test():
             params = EnvironmentSearchInput()
             result = await self.func(params)
             return result
 
-        result = asyncio.run(run_test())
+        # A private loop rather than asyncio.run(), which would clear the
+        # session loop shared by the pytest-asyncio tests on this worker
+        loop = asyncio.new_event_loop()
+        try:
+            result = loop.run_until_complete(run_test())
+        finally:
+            loop.close()
 
         # Helper to check masking
         def assert_masked(key, original_value):
@@ -215,6 +215,16 @@ class TestSafeCommandInput:
             SafeCommandInput(command="rm")
         assert "not in the whitelist" in str(exc_info.value)
 
+    def test_command_rejects_non_name_characters(self):
+        with pytest.raises(ValidationError) as exc_info:
+            SafeCommandInput(command="ping -c 1")
+        assert "should match pattern" in str(exc_info.value)
+
+    def test_extra_fields_forbidden(self):
+        with pytest.raises(ValidationError) as exc_info:
+            SafeCommandInput(command="ping", shell=True)
+        assert "Extra inputs are not permitted" in str(exc_info.value)
+
     def test_with_args(self):
         model = SafeCommandInput(command="ping", args=["-c", "4", "google.com"])
         assert model.args == ["-c", "4", "google.com"]
@@ -250,3 +260,8 @@ class TestSafeCommandInput:
     def test_too_many_args(self):
         with pytest.raises(ValidationError):
             SafeCommandInput(command="ping", args=["arg"] * 21)
+
+    def test_arg_too_long(self):
+        with pytest.raises(ValidationError) as exc_info:
+            SafeCommandInput(command="ping", args=["a" * 501])
+        assert "at most 500 characters" in str(exc_info.value)
@@ -0,0 +1,51 @@
+import json
+from collections import namedtuple
+from unittest.mock import patch
+
+from troubleshooting_mcp.models import ProcessSearchInput, ResponseFormat
+
+# Plain records standing in for psutil processes; the tool only reads .info and .rss
+MemInfo = namedtuple("MemInfo", "rss")
+Proc = namedtuple("Proc", "info")
+
+
+def _make_proc(cmdline):
+    return Proc(
+        info={
+            "pid": 4242,
+            "name": "java",
+            "cpu_percent": 1.0,
+            "memory_info": MemInfo(1024),
+            "status": "running",
+            "cmdline": cmdline,
+        }
+    )
+
+
+@patch("troubleshooting_mcp.tools.process_search.psutil.process_iter")
+async def test_process_search_masks_secrets(mock_iter, process_search_func):
+    mock_iter.return_value = [
+        _make_proc(["java", "-Dpassword=SuperSecretPassword123", "-jar"]),
+        _make_proc(["app", "--api-key=abc123def", "--token=tok_987"]),
+    ]
+
+    params = ProcessSearchInput(response_format=ResponseFormat.JSON)
+    result = await process_search_func(params)
+
+    assert "SuperSecretPassword123" not in result
+    assert "abc123def" not in result
+    assert "tok_987" not in result
+
+    cmdlines = [p["cmdline"] for p in json.loads(result)["processes"]]
+    assert "java -Dpassword=******** -jar" in cmdlines
+    assert "app --api-key=******** --token=********" in cmdlines
+
+
+@patch("troubleshooting_mcp.tools.process_search.psutil.process_iter")
+async def test_process_search_keeps_plain_arguments(mock_iter, process_search_func):
+    mock_iter.return_value = [_make_proc(["nginx", "-c", "/etc/nginx.conf"])]
+
+    params = ProcessSearchInput(pattern="nginx")
+    result = await process_search_func(params)
+
+    assert "nginx -c /etc/nginx.conf" in result
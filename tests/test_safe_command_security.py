@@ -1,38 +1,166 @@
+from unittest.mock import MagicMock, patch
+
 import pytest
 from pydantic import ValidationError
 
-try:
-    from troubleshooting_mcp.models import SafeCommandInput
-except ImportError:
-    from src.troubleshooting_mcp.models import SafeCommandInput
+from troubleshooting_mcp.models import ARGUMENT_POLICIES, SafeCommandInput, _check_command_args
+from troubleshooting_mcp.tools.safe_command import _which
+
+# Validated once at import; SafeCommandInput is frozen so these are safe to share
+PING_COUNT = SafeCommandInput(command="ping", args=["-c", "4", "google.com"])
+ADDR_SHOW = SafeCommandInput(command="ip", args=["addr", "show"])
 
-def test_safe_command_argument_blocking():
+def test_safe_command_argument_blocking(assert_blocked):
     """Test that dangerous arguments are blocked."""
 
     # ip netns (Network Namespace execution)
-    with pytest.raises(ValidationError, match="Argument .* is not allowed"):
+    with pytest.raises(ValidationError) as exc_info:
         SafeCommandInput(command="ip", args=["netns", "exec", "foo"])
+    assert_blocked(exc_info.value, "netns")
 
     # ip -n (Short for netns)
-    with pytest.raises(ValidationError, match="Argument .* is not allowed"):
+    with pytest.raises(ValidationError) as exc_info:
         SafeCommandInput(command="ip", args=["-n", "foo"])
+    assert_blocked(exc_info.value, "-n")
 
     # ip -batch (Batch execution from file)
-    with pytest.raises(ValidationError, match="Argument .* is not allowed"):
+    with pytest.raises(ValidationError) as exc_info:
         SafeCommandInput(command="ip", args=["-batch", "/tmp/commands"])
+    assert_blocked(exc_info.value, "-batch")
 
     # dig -f (Batch mode from file)
-    with pytest.raises(ValidationError, match="Argument .* is not allowed"):
+    with pytest.raises(ValidationError) as exc_info:
         SafeCommandInput(command="dig", args=["-f", "/etc/passwd"])
+    assert_blocked(exc_info.value, "-f")
 
     # ping -f (Flood)
-    with pytest.raises(ValidationError, match="Argument .* is not allowed"):
+    with pytest.raises(ValidationError) as exc_info:
         SafeCommandInput(command="ping", args=["-f", "localhost"])
+    assert_blocked(exc_info.value, "-f")
 
     # lsof +D (Recursive directory search - denial of service risk)
-    with pytest.raises(ValidationError, match="Argument .* is not allowed"):
+    with pytest.raises(ValidationError) as exc_info:
         SafeCommandInput(command="lsof", args=["+D", "/"])
+    assert_blocked(exc_info.value, "+D")
 
     # Valid commands should still work
-    SafeCommandInput(command="ping", args=["-c", "4", "google.com"])
-    SafeCommandInput(command="ip", args=["addr", "show"])
+    assert PING_COUNT.args == ["-c", "4", "google.com"]
+    assert ADDR_SHOW.args == ["addr", "show"]
+
+
+def test_safe_command_input_is_frozen():
+    """Test that validated commands cannot be altered after the checks ran."""
+    with pytest.raises(ValidationError):
+        ADDR_SHOW.args = ["netns", "exec", "foo"]
+
+
+@pytest.mark.parametrize("char", list(";&|`$()><{}!"))
+def test_shell_injection_prevention(char):
+    """Test that shell metacharacters are rejected in arguments."""
+    with pytest.raises(ValidationError) as exc_info:
+        SafeCommandInput(command="ping", args=["google.com", char, "ls"])
+    assert f"forbidden character '{char}'" in str(exc_info.value)
+
+
+def test_embedded_shell_metacharacters_rejected():
+    """Test that metacharacters embedded in a longer argument are caught as well."""
+    with pytest.raises(ValidationError, match="forbidden character"):
+        SafeCommandInput(command="dig", args=["google.com;cat /etc/passwd"])
+
+
+def test_ip_only_allows_read_only_subcommands(assert_blocked):
+    """Test that ip is limited to read-only objects and actions."""
+    # Abbreviations resolve the way ip does: "net" is netns
+    with pytest.raises(ValidationError) as exc_info:
+        SafeCommandInput(command="ip", args=["net", "exec", "foo", "sh"])
+    assert_blocked(exc_info.value, "net")
+
+    # ip accepts "--option" as "-option"
+    with pytest.raises(ValidationError) as exc_info:
+        SafeCommandInput(command="ip", args=["--netns", "foo", "addr"])
+    assert_blocked(exc_info.value, "--netns")
+
+    # Mutating actions are rejected
+    with pytest.raises(ValidationError) as exc_info:
+        SafeCommandInput(command="ip", args=["link", "set", "eth0", "down"])
+    assert_blocked(exc_info.value, "set")
+
+    with pytest.raises(ValidationError) as exc_info:
+        SafeCommandInput(command="ip", args=["-4", "addr", "add", "10.0.0.2/24", "dev", "eth0"])
+    assert_blocked(exc_info.value, "add")
+
+    # Read-only invocations still work
+    SafeCommandInput(command="ip", args=["a"])
+    SafeCommandInput(command="ip", args=["-s", "link", "show", "dev", "eth0"])
+    SafeCommandInput(command="ip", args=["-4", "route", "get", "8.8.8.8"])
+    SafeCommandInput(command="ip", args=["-V"])
+
+
+def test_ifconfig_only_displays_interfaces(assert_blocked):
+    """Test that ifconfig cannot reconfigure interfaces."""
+    with pytest.raises(ValidationError) as exc_info:
+        SafeCommandInput(command="ifconfig", args=["eth0", "down"])
+    assert_blocked(exc_info.value, "down")
+
+    with pytest.raises(ValidationError) as exc_info:
+        SafeCommandInput(command="ifconfig", args=["eth0", "promisc"])
+    assert_blocked(exc_info.value, "promisc")
+
+    SafeCommandInput(command="ifconfig", args=["-a"])
+    SafeCommandInput(command="ifconfig", args=["eth0"])
+
+
+def test_argument_policy_reports_matched_prefix():
+    """Test that a policy lookup returns the blocked prefix the argument starts with."""
+    assert ARGUMENT_POLICIES["ip"].match("-batch") == "-b"
+    assert ARGUMENT_POLICIES["ip"].match("netns") == "netns"
+    assert ARGUMENT_POLICIES["lsof"].match("+D") == "+D"
+    assert ARGUMENT_POLICIES["ping"].match("-c") is None
+    assert ARGUMENT_POLICIES["dig"].match("") is None
+
+
+def test_argument_checks_are_cached(assert_blocked):
+    """Test that repeated invocations reuse cached verdicts, including rejections."""
+    _check_command_args.cache_clear()
+    for _ in range(2):
+        SafeCommandInput(command="ping", args=["-c", "1", "localhost"])
+        with pytest.raises(ValidationError) as exc_info:
+            SafeCommandInput(command="ping", args=["-f", "localhost"])
+        assert_blocked(exc_info.value, "-f")
+
+    info = _check_command_args.cache_info()
+    assert info.misses == 2
+    assert info.hits == 2
+
+
+def test_command_lookup_follows_path_changes(tmp_path):
+    """Test that cached command lookups are keyed on the current PATH."""
+    fake_uptime = tmp_path / "uptime"
+    fake_uptime.write_text("#!/bin/sh\n")
+    fake_uptime.chmod(0o755)
+
+    assert _which("uptime", str(tmp_path)) == str(fake_uptime)
+    assert _which("uptime", str(tmp_path / "missing")) is None
+
+
+def test_command_lookup_does_not_cache_misses(tmp_path):
+    """Test that a command installed after a failed lookup is found on the next call."""
+    assert _which("uptime", str(tmp_path)) is None
+
+    fake_uptime = tmp_path / "uptime"
+    fake_uptime.write_text("#!/bin/sh\n")
+    fake_uptime.chmod(0o755)
+
+    assert _which("uptime", str(tmp_path)) == str(fake_uptime)
+
+
+@patch("troubleshooting_mcp.tools.safe_command.subprocess.run")
+@patch("troubleshooting_mcp.tools.safe_command._which", return_value="/usr/bin/ping")
+async def test_safe_command_runs_validated_args(mock_which, mock_run, safe_command_func):
+    """Test that the tool executes exactly the validated argument list."""
+    mock_run.return_value = MagicMock(returncode=0, stdout="pong", stderr="")
+
+    result = await safe_command_func(PING_COUNT)
+
+    assert mock_run.call_args.args[0] == ["/usr/bin/ping", "-c", "4", "google.com"]
+    assert "pong" in result
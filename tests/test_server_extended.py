@@ -3,44 +3,33 @@ Extended tests for server module.
 """
 
 import pytest
-from unittest.mock import patch, MagicMock
 
+import troubleshooting_mcp
+from troubleshooting_mcp import server
 
-def test_server_main_function_exists():
-    """Test that the main function exists and is callable."""
-    from troubleshooting_mcp.server import main
 
-    assert callable(main)
+@pytest.mark.parametrize(
+    "attr,check",
+    [
+        ("main", callable),
+        ("mcp", lambda mcp: mcp is not None),
+        ("mcp", lambda mcp: hasattr(mcp, "name")),
+    ],
+    ids=["main_callable", "mcp_instance", "mcp_named"],
+)
+def test_server_attrs(attr, check):
+    """Test that the server exposes a callable main and a named MCP instance."""
+    assert check(getattr(server, attr))
 
 
-def test_server_mcp_instance():
-    """Test that the MCP server instance is created."""
-    from troubleshooting_mcp.server import mcp
-
-    assert mcp is not None
-    assert hasattr(mcp, "name")
-
-
-def test_server_name():
-    """Test that the server has the correct name."""
-    from troubleshooting_mcp.server import mcp
-
-    # The server should have a name attribute
-    assert hasattr(mcp, "name")
-
-
-def test_package_exports():
+@pytest.mark.parametrize("attr", ["__version__", "__author__", "__license__"])
+def test_package_exports(attr):
     """Test that package exports are correct."""
-    from troubleshooting_mcp import __version__, __author__, __license__
-
-    assert isinstance(__version__, str)
-    assert isinstance(__author__, str)
-    assert isinstance(__license__, str)
+    assert isinstance(getattr(troubleshooting_mcp, attr), str)
 
 
-def test_all_tools_registered():
+async def test_all_tools_registered():
     """Test that all 7 tools are registered."""
-    from troubleshooting_mcp.server import mcp
+    tools = await server.mcp.list_tools()
 
-    # The MCP server should have tools registered
-    assert mcp is not None
+    assert len(tools) == 7
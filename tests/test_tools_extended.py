@@ -2,12 +2,8 @@
 Extended tests for diagnostic tools to achieve 90%+ coverage.
 """
 
-import json
-from unittest.mock import MagicMock
 import pytest
 
-from unittest.mock import MagicMock, patch
-
 from troubleshooting_mcp.models import (
     EnvironmentSearchInput,
     LogFileInput,
@@ -16,455 +12,154 @@ from troubleshooting_mcp.models import (
     ResourceMonitorInput,
     ResponseFormat,
     SafeCommandInput,
-    SystemInfoInput,
 )
 
 
+@pytest.mark.xdist_group("resource_monitor")
+@pytest.mark.usefixtures("non_blocking_cpu_percent")
 class TestResourceMonitorExtended:
     """Extended tests for resource_monitor tool to cover Markdown paths."""
 
-    @pytest.mark.asyncio
-    async def test_resource_monitor_markdown_full(self):
-        """Test resource monitor Markdown format with all sections."""
-        from troubleshooting_mcp.tools import resource_monitor
-
-        mcp = MagicMock()
-        tool_funcs = []
-
-        def mock_tool(*args, **kwargs):
-            def decorator(func):
-                tool_funcs.append(func)
-                return func
-            return decorator
-
-        mcp.tool = mock_tool
-        resource_monitor.register_resource_monitor(mcp)
-
-        func = tool_funcs[0]
-        params = ResourceMonitorInput(
-            include_per_cpu=True,
-        )
-        result = await func(params)
-
-        assert isinstance(result, str)
-        # Accept either successful output or error message
-        assert ("System Resource Monitor" in result or "CPU Usage" in result or
-                "Memory Usage" in result or "Error" in result or "error" in result.lower())
-
-    @pytest.mark.asyncio
-    async def test_resource_monitor_markdown_no_per_cpu(self):
-        """Test resource monitor Markdown without per-CPU stats."""
-        from troubleshooting_mcp.tools import resource_monitor
-
-        mcp = MagicMock()
-        tool_funcs = []
-
-        def mock_tool(*args, **kwargs):
-            def decorator(func):
-                tool_funcs.append(func)
-                return func
-            return decorator
-
-        mcp.tool = mock_tool
-        resource_monitor.register_resource_monitor(mcp)
-
-        func = tool_funcs[0]
+    @pytest.mark.parametrize("include_per_cpu", [True, False], ids=["full", "no_per_cpu"])
+    async def test_resource_monitor_markdown(self, resource_monitor_func, include_per_cpu):
+        """Test resource monitor Markdown format with and without per-CPU stats."""
         params = ResourceMonitorInput(
-            include_per_cpu=False,
+            include_per_cpu=include_per_cpu,
         )
-        result = await func(params)
+        result = await resource_monitor_func(params)
 
         assert isinstance(result, str)
         # Accept either successful output or error message
         assert "System Resource Monitor" in result or "Error" in result or "error" in result.lower()
 
 
+@pytest.mark.xdist_group("log_reader")
 class TestLogReaderExtended:
     """Extended tests for log_reader tool."""
 
-    @pytest.mark.asyncio
-    async def test_log_reader_common_log_paths(self, tmp_path):
+    async def test_log_reader_common_log_paths(self, sample_syslog, log_reader_func):
         """Test log reader with common log paths."""
-        from troubleshooting_mcp.tools import log_reader
-
-        # Create temp log
-        log_file = tmp_path / "syslog"
-        log_file.write_text("Test log entry\n")
-
-        mcp = MagicMock()
-        tool_funcs = []
-
-        def mock_tool(*args, **kwargs):
-            def decorator(func):
-                tool_funcs.append(func)
-                return func
-            return decorator
-
-        mcp.tool = mock_tool
-        log_reader.register_log_reader(mcp)
-
-        func = tool_funcs[0]
-        params = LogFileInput(file_path=str(log_file))
-        result = await func(params)
+        params = LogFileInput(file_path=str(sample_syslog))
+        result = await log_reader_func(params)
 
         assert isinstance(result, str)
 
-    @pytest.mark.asyncio
-    async def test_log_reader_json_format(self, tmp_path):
-        """Test log reader with JSON format."""
-        from troubleshooting_mcp.tools import log_reader
-
-        log_file = tmp_path / "test.log"
-        log_file.write_text("Line 1\nLine 2\nLine 3\n")
-
-        mcp = MagicMock()
-        tool_funcs = []
-
-        def mock_tool(*args, **kwargs):
-            def decorator(func):
-                tool_funcs.append(func)
-                return func
-            return decorator
-
-        mcp.tool = mock_tool
-        log_reader.register_log_reader(mcp)
-
-        func = tool_funcs[0]
+    async def test_log_reader_markdown_format(self, allowed_log_dir, sample_log, log_reader_func):
+        """Test log reader with Markdown format."""
         params = LogFileInput(
-            file_path=str(log_file),
-            response_format=ResponseFormat.JSON
+            file_path=str(sample_log),
         )
-        result = await func(params)
-
-        assert isinstance(result, str)
-        try:
-            data = json.loads(result)
-            assert "file_path" in data or "lines_read" in data
-        except json.JSONDecodeError:
-            # If not JSON, should be an error or Markdown output
-            assert len(result) > 0
-
-    @pytest.mark.asyncio
-    async def test_log_reader_markdown_format(self, tmp_path):
-        """Test log reader with Markdown format."""
-        from troubleshooting_mcp.tools import log_reader
-
-        log_file = tmp_path / "test.log"
-        log_file.write_text("Line 1\nLine 2\nLine 3\n")
-
-        mcp = MagicMock()
-        tool_funcs = []
-
-        def mock_tool(*args, **kwargs):
-            def decorator(func):
-                tool_funcs.append(func)
-                return func
-            return decorator
-
-        mcp.tool = mock_tool
-        with patch('troubleshooting_mcp.tools.log_reader.ALLOWED_LOG_DIRS', [str(tmp_path)]):
-            log_reader.register_log_reader(mcp)
-
-            func = tool_funcs[0]
-            params = LogFileInput(
-                file_path=str(log_file),
-            )
-            result = await func(params)
+        result = await log_reader_func(params)
 
         assert isinstance(result, str)
         assert "Log File" in result or "Line" in result
 
-    @pytest.mark.asyncio
-    async def test_log_reader_no_file_path(self):
+    async def test_log_reader_no_file_path(self, log_reader_func):
         """Test log reader without file path (uses common paths)."""
-        from troubleshooting_mcp.tools import log_reader
-
-        mcp = MagicMock()
-        tool_funcs = []
-
-        def mock_tool(*args, **kwargs):
-            def decorator(func):
-                tool_funcs.append(func)
-                return func
-            return decorator
-
-        mcp.tool = mock_tool
-        log_reader.register_log_reader(mcp)
-
-        func = tool_funcs[0]
         params = LogFileInput()
-        result = await func(params)
+        result = await log_reader_func(params)
 
         assert isinstance(result, str)
 
 
+@pytest.mark.xdist_group("network_diagnostic")
 class TestNetworkDiagnosticExtended:
     """Extended tests for network_diagnostic tool."""
 
-    @pytest.mark.asyncio
-    async def test_network_diagnostic_markdown_format(self):
-        """Test network diagnostic with Markdown format."""
-        from troubleshooting_mcp.tools import network_diagnostic
-
-        mcp = MagicMock()
-        tool_funcs = []
-
-        def mock_tool(*args, **kwargs):
-            def decorator(func):
-                tool_funcs.append(func)
-                return func
-            return decorator
-
-        mcp.tool = mock_tool
-        network_diagnostic.register_network_diagnostic(mcp)
-
-        func = tool_funcs[0]
-        params = NetworkDiagnosticInput(
-            host="8.8.8.8",
-        )
-        result = await func(params)
-
-        assert isinstance(result, str)
-
-    @pytest.mark.asyncio
-    async def test_network_diagnostic_with_port_markdown(self):
+    async def test_network_diagnostic_with_port_markdown(self, refused_socket, network_diagnostic_func):
         """Test network diagnostic with port in Markdown."""
-        from troubleshooting_mcp.tools import network_diagnostic
-
-        mcp = MagicMock()
-        tool_funcs = []
-
-        def mock_tool(*args, **kwargs):
-            def decorator(func):
-                tool_funcs.append(func)
-                return func
-            return decorator
-
-        mcp.tool = mock_tool
-        network_diagnostic.register_network_diagnostic(mcp)
-
-        func = tool_funcs[0]
         params = NetworkDiagnosticInput(
             host="8.8.8.8",
             port=54321,
             timeout=1,
         )
-        result = await func(params)
+        result = await network_diagnostic_func(params)
 
         assert isinstance(result, str)
+        assert "Port 54321 is CLOSED or filtered" in result
 
-    @pytest.mark.asyncio
-    async def test_network_diagnostic_dns_only(self):
-        """Test network diagnostic DNS resolution without port."""
-        from troubleshooting_mcp.tools import network_diagnostic
-
-        mcp = MagicMock()
-        tool_funcs = []
-
-        def mock_tool(*args, **kwargs):
-            def decorator(func):
-                tool_funcs.append(func)
-                return func
-            return decorator
-
-        mcp.tool = mock_tool
-        network_diagnostic.register_network_diagnostic(mcp)
-
-        func = tool_funcs[0]
+    async def test_network_diagnostic_dns_only(self, network_diagnostic_func):
+        """Test network diagnostic DNS resolution without port, in Markdown format."""
         params = NetworkDiagnosticInput(
             host="8.8.8.8",
         )
-        result = await func(params)
+        result = await network_diagnostic_func(params)
 
         assert isinstance(result, str)
 
 
+@pytest.mark.xdist_group("safe_command")
+@pytest.mark.slow
 class TestSafeCommandExtended:
     """Extended tests for safe_command tool."""
 
-    @pytest.mark.asyncio
-    async def test_safe_command_json_format(self):
-        """Test safe command with JSON format."""
-        from troubleshooting_mcp.tools import safe_command
-
-        mcp = MagicMock()
-        tool_funcs = []
-
-        def mock_tool(*args, **kwargs):
-            def decorator(func):
-                tool_funcs.append(func)
-                return func
-            return decorator
-
-        mcp.tool = mock_tool
-        safe_command.register_safe_command(mcp)
+    async def test_safe_command_whoami(self, safe_command_func):
+        """Test safe command with whoami."""
+        params = SafeCommandInput(command="whoami")
+        result = await safe_command_func(params)
 
-        func = tool_funcs[0]
-        params = SafeCommandInput(
-            command="whoami",
-            response_format=ResponseFormat.JSON
+        # Hosts without whoami get the tool's not-found error instead
+        assert result.startswith(
+            ("# Command Execution: whoami", "Error: Command 'whoami' not found")
         )
-        result = await func(params)
 
-        assert isinstance(result, str)
-        try:
-            data = json.loads(result)
-            assert "command" in data
-        except json.JSONDecodeError:
-            # Error message is also acceptable
-            pass
-
-    @pytest.mark.asyncio
-    async def test_safe_command_markdown_format(self):
+    async def test_safe_command_markdown_format(self, safe_command_func):
         """Test safe command with Markdown format."""
-        from troubleshooting_mcp.tools import safe_command
-
-        mcp = MagicMock()
-        tool_funcs = []
-
-        def mock_tool(*args, **kwargs):
-            def decorator(func):
-                tool_funcs.append(func)
-                return func
-            return decorator
-
-        mcp.tool = mock_tool
-        safe_command.register_safe_command(mcp)
-
-        func = tool_funcs[0]
         params = SafeCommandInput(
             command="hostname",
         )
-        result = await func(params)
+        result = await safe_command_func(params)
 
         assert isinstance(result, str)
 
-    @pytest.mark.asyncio
-    async def test_safe_command_free(self):
+    async def test_safe_command_free(self, safe_command_func):
         """Test safe command with free."""
-        from troubleshooting_mcp.tools import safe_command
-
-        mcp = MagicMock()
-        tool_funcs = []
-
-        def mock_tool(*args, **kwargs):
-            def decorator(func):
-                tool_funcs.append(func)
-                return func
-            return decorator
-
-        mcp.tool = mock_tool
-        safe_command.register_safe_command(mcp)
-
-        func = tool_funcs[0]
         params = SafeCommandInput(command="free")
-        result = await func(params)
+        result = await safe_command_func(params)
 
         assert isinstance(result, str)
 
 
+@pytest.mark.xdist_group("process_search")
 class TestProcessSearchExtended:
     """Extended tests for process_search tool."""
 
-    @pytest.mark.asyncio
-    async def test_process_search_markdown_format(self):
+    async def test_process_search_markdown_format(self, process_search_func):
         """Test process search with Markdown format."""
-        from troubleshooting_mcp.tools import process_search
-
-        mcp = MagicMock()
-        tool_funcs = []
-
-        def mock_tool(*args, **kwargs):
-            def decorator(func):
-                tool_funcs.append(func)
-                return func
-            return decorator
-
-        mcp.tool = mock_tool
-        process_search.register_process_search(mcp)
-
-        func = tool_funcs[0]
         params = ProcessSearchInput(
             limit=5,
         )
-        result = await func(params)
+        result = await process_search_func(params)
 
         assert isinstance(result, str)
 
-    @pytest.mark.asyncio
-    async def test_process_search_with_pattern_markdown(self):
+    async def test_process_search_with_pattern_markdown(self, process_search_func):
         """Test process search with pattern in Markdown."""
-        from troubleshooting_mcp.tools import process_search
-
-        mcp = MagicMock()
-        tool_funcs = []
-
-        def mock_tool(*args, **kwargs):
-            def decorator(func):
-                tool_funcs.append(func)
-                return func
-            return decorator
-
-        mcp.tool = mock_tool
-        process_search.register_process_search(mcp)
-
-        func = tool_funcs[0]
         params = ProcessSearchInput(
             pattern="python",
             limit=10,
         )
-        result = await func(params)
+        result = await process_search_func(params)
 
         assert isinstance(result, str)
 
 
+@pytest.mark.xdist_group("environment_inspect")
 class TestEnvironmentInspectExtended:
     """Extended tests for environment_inspect tool."""
 
-    @pytest.mark.asyncio
-    async def test_environment_inspect_markdown_format(self):
+    async def test_environment_inspect_markdown_format(self, environment_inspect_func):
         """Test environment inspect with Markdown format."""
-        from troubleshooting_mcp.tools import environment_inspect
-
-        mcp = MagicMock()
-        tool_funcs = []
-
-        def mock_tool(*args, **kwargs):
-            def decorator(func):
-                tool_funcs.append(func)
-                return func
-            return decorator
-
-        mcp.tool = mock_tool
-        environment_inspect.register_environment_inspect(mcp)
-
-        func = tool_funcs[0]
         params = EnvironmentSearchInput(response_format=ResponseFormat.MARKDOWN)
-        result = await func(params)
+        result = await environment_inspect_func(params)
 
         assert isinstance(result, str)
 
-    @pytest.mark.asyncio
-    async def test_environment_inspect_with_pattern_markdown(self):
+    async def test_environment_inspect_with_pattern_markdown(self, environment_inspect_func):
         """Test environment inspect with pattern in Markdown."""
-        from troubleshooting_mcp.tools import environment_inspect
-
-        mcp = MagicMock()
-        tool_funcs = []
-
-        def mock_tool(*args, **kwargs):
-            def decorator(func):
-                tool_funcs.append(func)
-                return func
-            return decorator
-
-        mcp.tool = mock_tool
-        environment_inspect.register_environment_inspect(mcp)
-
-        func = tool_funcs[0]
         params = EnvironmentSearchInput(
             pattern="PATH",
         )
-        result = await func(params)
+        result = await environment_inspect_func(params)
 
         assert isinstance(result, str)
@@ -76,6 +76,12 @@ class TestHandleError:
         assert "Invalid input" in result
         assert "Invalid value" in result
 
+    def test_subclass_uses_parent_message(self):
+        error = UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+        result = handle_error(error)
+        assert result.startswith("Error: Invalid input - ")
+        assert "invalid start byte" in result
+
     def test_generic_exception(self):
         error = RuntimeError("Something went wrong")
         result = handle_error(error)
@@ -96,9 +102,8 @@ class TestCheckCharacterLimit:
         result = check_character_limit(content)
         assert result == content
 
-    def test_content_exceeds_limit(self):
-        content = "x" * (CHARACTER_LIMIT + 1000)
-        result = check_character_limit(content)
+    def test_content_exceeds_limit(self, oversized_content):
+        result = check_character_limit(oversized_content)
         assert len(result) > CHARACTER_LIMIT  # Includes truncation message
         assert "TRUNCATED" in result
         assert str(CHARACTER_LIMIT) in result
@@ -108,7 +113,6 @@ class TestCheckCharacterLimit:
         result = check_character_limit("")
         assert result == ""
 
-    def test_custom_data_type_in_message(self):
-        content = "x" * (CHARACTER_LIMIT + 100)
-        result = check_character_limit(content, "test data")
+    def test_custom_data_type_in_message(self, oversized_content):
+        result = check_character_limit(oversized_content, "test data")
         assert "TRUNCATED" in result
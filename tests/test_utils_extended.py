@@ -2,16 +2,13 @@
 Extended tests for utils module to increase coverage.
 """
 
-import pytest
-from unittest.mock import patch, MagicMock
-
+from troubleshooting_mcp.constants import CHARACTER_LIMIT
 from troubleshooting_mcp.utils import (
+    check_character_limit,
     format_bytes,
     format_timestamp,
     handle_error,
-    check_character_limit,
 )
-from troubleshooting_mcp.constants import CHARACTER_LIMIT
 
 
 def test_handle_error_with_oserror():
@@ -57,6 +54,16 @@ def test_format_bytes_exact_boundaries():
     assert "1.00 GB" == format_bytes(1024 ** 3)
 
 
+def test_format_bytes_bit_length_boundary():
+    """Test format_bytes on either side of each power-of-1024 boundary."""
+    assert format_bytes(1023) == "1023.00 B"
+    assert format_bytes(1024 ** 2 - 1) == "1024.00 KB"
+    assert format_bytes(1536.0) == "1.50 KB"
+    assert format_bytes(1024 ** 5) == "1.00 PB"
+    # Anything past PB stays in PB
+    assert format_bytes(3 * 1024 ** 6) == "3072.00 PB"
+
+
 def test_format_timestamp_various_times():
     """Test format_timestamp with various timestamps."""
     # Year 2000
@@ -71,10 +78,9 @@ def test_format_timestamp_various_times():
     assert isinstance(result, str)
 
 
-def test_check_character_limit_with_custom_data_type():
+def test_check_character_limit_with_custom_data_type(oversized_content):
     """Test check_character_limit with custom data type label."""
-    long_content = "x" * (CHARACTER_LIMIT + 500)
-    result = check_character_limit(long_content, "custom data")
+    result = check_character_limit(oversized_content, "custom data")
     assert "TRUNCATED" in result
     # Verify the result contains truncated content
     assert len(result) > CHARACTER_LIMIT
@@ -3,8 +3,8 @@
 Troubleshooting MCP Server - Backward Compatibility Entry Point
 
 This file provides backward compatibility for users who have configured
-Claude Desktop with the old single-file structure. It simply imports and
-runs the modular server from the src package.
+Claude Desktop with the old single-file structure. It runs the modular
+server from the src package, importing it only once main() is called.
 
 For new installations, you can use the package directly:
     python -m troubleshooting_mcp.server
@@ -14,7 +14,24 @@ Or install it and use the command:
     troubleshooting-mcp
 """
 
-from src.troubleshooting_mcp.server import main
+import sys
+from pathlib import Path
+
+_SRC_DIR = Path(__file__).resolve().parent / "src"
+
+
+def main():
+    """Run the packaged server, importing it only when invoked."""
+    # Move src/ to the front even when PYTHONPATH or an editable install already
+    # lists it, so the package rather than this script answers to the
+    # troubleshooting_mcp name
+    if _SRC_DIR.is_dir():
+        src = str(_SRC_DIR)
+        sys.path[:] = [src] + [entry for entry in sys.path if entry != src]
+    from troubleshooting_mcp.server import main as server_main
+
+    return server_main()
+
 
 if __name__ == "__main__":
     main()